@@ -1,9 +1,14 @@
-from flask import Flask, render_template, request, redirect, url_for, flash, session
+from flask import Flask, render_template, request, redirect, url_for, flash, session, jsonify, send_from_directory, abort
 import json
 import os
 import datetime
+import math
+import sys
+import mimetypes
+import unicodedata
 from apscheduler.schedulers.background import BackgroundScheduler  # NOVO
 import atexit  # NOVO
+from assets import DIST_DIR as ASSETS_DIST_DIR, carregar_manifesto, carregar_publicados, arquivos_desatualizados
 
 # --- Configuração de Dados Globais e Persistência ---
 
@@ -14,6 +19,9 @@ NOME_SISTEMA = "Hashem Personal Trainer"
 clientes = {}
 proximo_cliente_id = 1
 usuarios = {}
+# Arquivos estáticos com hash, gerados por: python assets.py construir (ver assets.py)
+assets_manifesto = {}  # nome original -> nome com hash (ex.: style.css -> style.1a2b3c4d5e.css)
+assets_publicados = set()  # Nomes com hash (deste e de builds anteriores) que a rota /assets pode servir
 
 exercicios_cadastrados = [
     "Supino Reto", "Agachamento Livre", "Remada Cavalinho",
@@ -21,14 +29,22 @@ exercicios_cadastrados = [
 ]
 
 IMAGENS_EXERCICIOS = {
-    "Supino Reto": "supino_reto.jpg",
-    "Agachamento Livre": "agachamento_livre.jpg",
-    "Remada Cavalinho": "remada_cavalinho.jpg",
-    "Desenvolvimento Halteres": "desenvolvimento_halteres.jpg",
-    "Cadeira Extensora": "cadeira_extensora.jpg",
-    "Rosca Direta": "rosca_direta.jpg",
+    "Supino Reto": "supino_reto.png",
+    "Agachamento Livre": "agachamento_livre.png",
+    "Remada Cavalinho": "remada_cavalinho.png",
+    "Desenvolvimento Halteres": "desenvolvimento_halteres.png",
+    "Cadeira Extensora": "cadeira_extensora.png",
+    "Rosca Direta": "rosca_direta.png",
 }
 
+# Índices de busca em memória. Cada registro ocupa uma posição (bit) e cada trigrama guarda um
+# inteiro com os bits dos registros que o contêm (chave -> tupla de trigramas, para remoção).
+# Posições liberadas por remoções ficam em 'livres' e são reaproveitadas nas próximas inserções.
+_indice_clientes = {'trigramas': {}, 'documentos': {}, 'posicoes': {}, 'chaves': [], 'livres': []}
+_indice_usuarios = {'trigramas': {}, 'documentos': {}, 'posicoes': {}, 'chaves': [], 'livres': []}
+LIMIAR_BUSCA = 0.5  # Fração mínima de trigramas da consulta encontrados no registro (apenas texto)
+LIMITE_BUSCA_PAGINA = 100  # Máximo de resultados exibidos nas buscas das páginas HTML
+
 
 def _carregar_dados():
     """Carrega dados de clientes do arquivo JSON."""
@@ -42,6 +58,7 @@ def _carregar_dados():
                 proximo_cliente_id = data.get('proximo_cliente_id', 1)
             except json.JSONDecodeError:
                 pass
+    _reconstruir_indice(_indice_clientes, ((c['id'], _trigramas_cliente(c)) for c in clientes.values()))
 
 
 def _salvar_dados():
@@ -63,6 +80,7 @@ def _carregar_usuarios():
                 usuarios = json.load(f)
             except json.JSONDecodeError:
                 pass
+    _reconstruir_indice(_indice_usuarios, ((u['celular'], _trigramas_usuario(u)) for u in usuarios.values()))
 
 
 def _salvar_usuarios():
@@ -79,16 +97,220 @@ def _salvar_usuarios():
             'data_cadastro': datetime.date.today().strftime('%Y-%m-%d'),
             'status_pagamento': 'N/A'
         }
+        _indexar_usuario(usuarios['99999999999'])
 
     with open(USUARIOS_FILE, 'w') as f:
         json.dump(usuarios, f, indent=4)
 
 
+def _carregar_manifesto_assets():
+    """Carrega o manifesto de arquivos estáticos com hash e avisa se static/ mudou desde o build."""
+    global assets_manifesto, assets_publicados
+    assets_manifesto = carregar_manifesto()
+    assets_publicados = carregar_publicados()
+
+    desatualizados = arquivos_desatualizados(assets_manifesto) if assets_manifesto else []
+    if desatualizados:
+        app.logger.warning(
+            "⚠️ Build de arquivos estáticos desatualizado (%s). Fora do modo debug, as páginas continuam "
+            "usando as versões antigas até rodar: python assets.py construir", ', '.join(desatualizados))
+
+
 def hash_senha_simples(senha):
     """Inverte a string para simular um hash simples."""
     return senha[::-1]
 
 
+# --- Índice de Busca (Trigramas em Memória) ---
+
+def _normalizar_celular(celular):
+    """Remove espaços, hífens e parênteses do celular, deixando apenas os dígitos digitados."""
+    return str(celular).replace(' ', '').replace('-', '').replace('(', '').replace(')', '')
+
+
+def _normalizar_texto(texto):
+    """Converte para minúsculas e remove acentos (ex.: 'João' -> 'joao')."""
+    texto = unicodedata.normalize('NFKD', str(texto or '').lower())
+    return ''.join(c for c in texto if not unicodedata.combining(c))
+
+
+def _trigramas_texto(texto):
+    """Trigramas de cada palavra, com bordas, para favorecer inícios e fins de palavra."""
+    trigramas = set()
+    for palavra in _normalizar_texto(texto).split():
+        # Uma única borda: '  a' (toda palavra iniciada por 'a') seria comum demais para filtrar algo
+        palavra = f' {palavra} '
+        trigramas.update(palavra[i:i + 3] for i in range(len(palavra) - 2))
+    return trigramas
+
+
+def _trigramas_celular(celular):
+    """Trigramas sem bordas, para encontrar qualquer trecho do número."""
+    digitos = _normalizar_celular(celular or '')
+    return {digitos[i:i + 3] for i in range(len(digitos) - 2)}
+
+
+def _consulta_celular(termo):
+    """Retorna os dígitos do termo se ele for um trecho de celular, senão None."""
+    digitos = _normalizar_celular(termo)
+    return digitos if digitos.isdigit() else None
+
+
+def _indexar(indice, chave, trigramas):
+    _desindexar(indice, chave)
+    if indice['livres']:
+        posicao = indice['livres'].pop()
+        indice['chaves'][posicao] = chave
+    else:
+        posicao = len(indice['chaves'])
+        indice['chaves'].append(chave)
+    indice['posicoes'][chave] = posicao
+    # Tupla de strings internadas: os trigramas se repetem entre milhares de registros
+    trigramas = tuple(sys.intern(trigrama) for trigrama in trigramas)
+    indice['documentos'][chave] = trigramas
+    bit = 1 << posicao
+    for trigrama in trigramas:
+        indice['trigramas'][trigrama] = indice['trigramas'].get(trigrama, 0) | bit
+
+
+def _desindexar(indice, chave):
+    posicao = indice['posicoes'].pop(chave, None)
+    if posicao is None:
+        return
+    # Limpa os bits antes de soltar a posição, para uma busca simultânea não encontrar a posição vazia
+    bit = 1 << posicao
+    for trigrama in indice['documentos'].pop(chave):
+        restantes = indice['trigramas'][trigrama] & ~bit
+        if restantes:
+            indice['trigramas'][trigrama] = restantes
+        else:
+            del indice['trigramas'][trigrama]
+    indice['chaves'][posicao] = None
+    indice['livres'].append(posicao)
+
+
+def _reconstruir_indice(indice, registros):
+    """Recria o índice a partir de pares (chave, trigramas), montando o inteiro de cada trigrama uma única vez.
+
+    Usado na carga dos arquivos: inserir registro a registro copiaria o inteiro inteiro a cada bit novo.
+    """
+    chaves, posicoes, documentos, posicoes_por_trigrama = [], {}, {}, {}
+    for posicao, (chave, trigramas) in enumerate(registros):
+        trigramas = tuple(sys.intern(trigrama) for trigrama in trigramas)
+        chaves.append(chave)
+        posicoes[chave] = posicao
+        documentos[chave] = trigramas
+        for trigrama in trigramas:
+            posicoes_por_trigrama.setdefault(trigrama, []).append(posicao)
+
+    bits_por_trigrama = {}
+    for trigrama, lista in posicoes_por_trigrama.items():
+        mapa = bytearray(len(chaves) // 8 + 1)
+        for posicao in lista:
+            mapa[posicao >> 3] |= 1 << (posicao & 7)
+        bits_por_trigrama[trigrama] = int.from_bytes(mapa, 'little')
+
+    indice['trigramas'] = bits_por_trigrama
+    indice['documentos'] = documentos
+    indice['posicoes'] = posicoes
+    indice['chaves'] = chaves
+    indice['livres'] = []
+
+
+def _trigramas_cliente(cliente):
+    trigramas = _trigramas_texto(f"{cliente.get('nome', '')} {cliente.get('objetivo', '')}")
+    return trigramas | _trigramas_celular(cliente.get('aluno_celular'))
+
+
+def _trigramas_usuario(usuario):
+    trigramas = _trigramas_texto(usuario.get('nome_completo', ''))
+    return trigramas | _trigramas_celular(usuario.get('celular'))
+
+
+def _indexar_cliente(cliente):
+    _indexar(_indice_clientes, cliente['id'], _trigramas_cliente(cliente))
+
+
+def _indexar_usuario(usuario):
+    _indexar(_indice_usuarios, usuario['celular'], _trigramas_usuario(usuario))
+
+
+def _buscar(indice, termo, limite=20, filtro=None, celular_de=None):
+    """Retorna as chaves mais relevantes para o termo, da maior para a menor pontuação.
+
+    Para texto, a pontuação é a fração dos trigramas da consulta presentes no registro,
+    o que tolera erros de digitação. Trechos de celular não são aproximados: o número
+    retornado por celular_de(chave) precisa conter os dígitos digitados.
+    Em empates, vale a ordem das posições no índice.
+    """
+    digitos = _consulta_celular(termo)
+    if digitos is not None:
+        consulta = _trigramas_celular(digitos)
+        limiar = 1.0
+        if celular_de is not None:
+            filtro_original = filtro
+            filtro = lambda chave: (digitos in (celular_de(chave) or '')
+                                    and (filtro_original is None or filtro_original(chave)))
+    else:
+        consulta = _trigramas_texto(termo)
+        limiar = LIMIAR_BUSCA
+    if not consulta or limite <= 0:
+        return []
+
+    minimo = math.ceil(limiar * len(consulta))
+
+    # Soma os bits de todos os trigramas da consulta de uma vez, como um contador binário:
+    # o bit i de casas[k] é o k-ésimo bit do número de acertos do registro na posição i.
+    casas = []
+    for trigrama in consulta:
+        vai_um = indice['trigramas'].get(trigrama, 0)
+        for k in range(len(casas)):
+            if not vai_um:
+                break
+            casas[k], vai_um = casas[k] ^ vai_um, casas[k] & vai_um
+        if vai_um:
+            casas.append(vai_um)
+
+    resultados = []
+    for acertos in range(len(consulta), minimo - 1, -1):
+        if acertos >> len(casas):
+            continue  # Nenhum registro chegou a esse número de acertos
+
+        # Bits dos registros com exatamente `acertos` trigramas em comum
+        mascara = -1
+        for k, casa in enumerate(casas):
+            mascara &= casa if acertos >> k & 1 else ~casa
+
+        bits = bin(mascara)[:1:-1]  # O caractere i corresponde à posição i
+        posicao = bits.find('1')
+        while posicao != -1:
+            chave = indice['chaves'][posicao]
+            # None: registro removido por outra requisição durante esta busca
+            if chave is not None and (filtro is None or filtro(chave)):
+                resultados.append(chave)
+                if len(resultados) >= limite:
+                    return resultados
+            posicao = bits.find('1', posicao + 1)
+    return resultados
+
+
+def buscar_clientes(termo, professor_celular=None, limite=20):
+    """Busca clientes por nome, objetivo ou celular do aluno vinculado."""
+    filtro = None
+    if professor_celular:
+        filtro = lambda cid: clientes.get(cid, {}).get('professor_celular') == professor_celular
+    chaves = _buscar(_indice_clientes, termo, limite, filtro,
+                     celular_de=lambda cid: clientes.get(cid, {}).get('aluno_celular'))
+    # Um registro pode ter sido removido entre a busca e a leitura
+    return [clientes[cid] for cid in chaves if cid in clientes]
+
+
+def buscar_usuarios(termo, limite=20):
+    """Busca usuários por nome completo ou celular."""
+    chaves = _buscar(_indice_usuarios, termo, limite, celular_de=lambda celular: celular)
+    return [usuarios[celular] for celular in chaves if celular in usuarios]
+
+
 # --- Funções de Lógica de Negócios (CRUD) ---
 
 def cadastrar_usuario(nome_completo, celular, senha, perfil):
@@ -107,6 +329,7 @@ def cadastrar_usuario(nome_completo, celular, senha, perfil):
         'data_cadastro': datetime.date.today().strftime('%Y-%m-%d'),
         'status_pagamento': 'Pendente' if perfil == 'aluno' else 'N/A'
     }
+    _indexar_usuario(usuarios[celular])
     _salvar_usuarios()
     return True, "Usuário cadastrado com sucesso."
 
@@ -116,6 +339,8 @@ def remover_usuario(celular):
     if celular in usuarios:
         if usuarios[celular]['perfil'] == 'admin':
             return False, "Não é permitido remover o administrador principal."
+        # Sai do índice antes do dicionário, para nenhuma busca devolver uma chave já apagada
+        _desindexar(_indice_usuarios, celular)
         del usuarios[celular]
         _salvar_usuarios()
         return True, "Usuário removido com sucesso."
@@ -134,6 +359,7 @@ def cadastrar_cliente(nome, objetivo, professor_celular=None, aluno_celular=None
         "aluno_celular": aluno_celular  # Vinculação ao Aluno (para acesso)
     }
     clientes[proximo_cliente_id] = novo_cliente
+    _indexar_cliente(novo_cliente)
     proximo_cliente_id += 1
     _salvar_dados()
     return novo_cliente
@@ -142,6 +368,8 @@ def cadastrar_cliente(nome, objetivo, professor_celular=None, aluno_celular=None
 def remover_cliente(cliente_id):
     if cliente_id in clientes:
         nome = clientes[cliente_id]['nome']
+        # Sai do índice antes do dicionário, para nenhuma busca devolver uma chave já apagada
+        _desindexar(_indice_clientes, cliente_id)
         del clientes[cliente_id]
         _salvar_dados()
         return nome, True
@@ -194,6 +422,7 @@ app.secret_key = 'uma_chave_secreta_muito_segura_para_hashem'
 _carregar_dados()
 _carregar_usuarios()
 _salvar_usuarios()
+_carregar_manifesto_assets()
 
 # Adiciona um cliente de teste para o Admin/Professor padrão se não houver clientes
 if not clientes:
@@ -208,7 +437,7 @@ if not clientes:
 # Função para formatar o celular (usada no jinja2)
 def formatar_celular(celular):
     """Formata o número de celular (11 dígitos, sem DDI) para o padrão (00) 90000-0000."""
-    celular = str(celular).replace(' ', '').replace('-', '').replace('(', '').replace(')', '')
+    celular = _normalizar_celular(celular)
     if len(celular) == 11:
         return f'({celular[0:2]}) {celular[2:7]}-{celular[7:]}'
     elif len(celular) == 10:
@@ -219,6 +448,24 @@ def formatar_celular(celular):
 app.jinja_env.filters['celular'] = formatar_celular
 
 
+# Função para gerar a URL de um arquivo estático (usada no jinja2)
+def asset(filename):
+    """Retorna a URL com hash do arquivo; sem build, usa /static normalmente."""
+    # Em debug (desenvolvimento) o manifesto é ignorado, para que edições em static/ apareçam na hora
+    if app.debug or not assets_manifesto:
+        return url_for('static', filename=filename)
+
+    nome_com_hash = assets_manifesto.get(filename)
+    if not nome_com_hash:
+        app.logger.error("❌ Arquivo estático '%s' fora do manifesto, servido sem hash nem compressão. "
+                         "Rode: python assets.py construir && python assets.py verificar", filename)
+        return url_for('static', filename=filename)
+    return url_for('assets_com_hash', filename=nome_com_hash)
+
+
+app.jinja_env.globals['asset'] = asset
+
+
 # Injeta dados globais em todos os templates
 @app.context_processor
 def inject_global_data():
@@ -231,6 +478,33 @@ def inject_global_data():
     )
 
 
+# --- Arquivos Estáticos com Hash ---
+
+@app.route('/assets/<path:filename>')
+def assets_com_hash(filename):
+    """Serve o arquivo pré-comprimido (.br/.gz) aceito pelo navegador, com cache imutável de 1 ano."""
+    # Só nomes com hash: qualquer outro arquivo em static/dist não pode receber cache imutável
+    if filename not in assets_publicados:
+        abort(404)
+
+    mimetype = mimetypes.guess_type(filename)[0]
+    encoding = None
+    arquivo = filename
+
+    for nome, extensao in (('br', '.br'), ('gzip', '.gz')):
+        if request.accept_encodings[nome] and os.path.exists(os.path.join(ASSETS_DIST_DIR, filename + extensao)):
+            encoding, arquivo = nome, filename + extensao
+            break
+
+    resposta = send_from_directory(ASSETS_DIST_DIR, arquivo, mimetype=mimetype, max_age=31536000)
+    resposta.cache_control.public = True
+    resposta.cache_control.immutable = True
+    resposta.vary.add('Accept-Encoding')
+    if encoding:
+        resposta.headers['Content-Encoding'] = encoding
+    return resposta
+
+
 # --- Controle de Acesso e ROTAS DE AUTENTICAÇÃO ---
 
 def login_required(perfil_minimo=None):
@@ -387,8 +661,20 @@ def admin_area():
                 flash("⚠️ Usuário não encontrado.", 'error')
             return redirect(url_for('admin_area'))
 
-    lista_usuarios = sorted(usuarios.values(), key=lambda u: u['perfil'], reverse=True)
-    return render_template('admin.html', lista_usuarios=lista_usuarios)
+    termo = request.args.get('q', '').strip()
+    busca_truncada = False
+    if termo:
+        # Pede um resultado a mais só para saber se a lista exibida foi cortada
+        lista_usuarios = buscar_usuarios(termo, limite=LIMITE_BUSCA_PAGINA + 1)
+        busca_truncada = len(lista_usuarios) > LIMITE_BUSCA_PAGINA
+        lista_usuarios = lista_usuarios[:LIMITE_BUSCA_PAGINA]
+    else:
+        lista_usuarios = sorted(usuarios.values(), key=lambda u: u['perfil'], reverse=True)
+    return render_template('admin.html',
+                           lista_usuarios=lista_usuarios,
+                           termo=termo,
+                           busca_truncada=busca_truncada,
+                           limite_busca=LIMITE_BUSCA_PAGINA)
 
 # --- ROTAS DA ÁREA DO PROFESSOR (Gerenciamento de Clientes) ---
 
@@ -398,11 +684,21 @@ def index():
 
     professor_celular = session.get('user_celular')
 
+    termo = request.args.get('q', '').strip()
+
     # Filtra os clientes: só mostra os clientes vinculados a este professor
-    clientes_do_professor = {
-        cid: c for cid, c in clientes.items()
+    clientes_do_professor = [
+        c for c in clientes.values()
         if c.get('professor_celular') == professor_celular
-    }
+    ]
+    total_clientes = len(clientes_do_professor)
+
+    busca_truncada = False
+    if termo:
+        # Pede um resultado a mais só para saber se a lista exibida foi cortada
+        clientes_do_professor = buscar_clientes(termo, professor_celular, limite=LIMITE_BUSCA_PAGINA + 1)
+        busca_truncada = len(clientes_do_professor) > LIMITE_BUSCA_PAGINA
+        clientes_do_professor = clientes_do_professor[:LIMITE_BUSCA_PAGINA]
 
     # Lista de alunos registrados que AINDA NÃO SÃO clientes
     alunos_disponiveis = [
@@ -411,8 +707,40 @@ def index():
     ]
 
     return render_template('index.html',
-                           clientes=clientes_do_professor.values(),
-                           alunos_disponiveis=alunos_disponiveis)
+                           clientes=clientes_do_professor,
+                           total_clientes=total_clientes,
+                           alunos_disponiveis=alunos_disponiveis,
+                           termo=termo,
+                           busca_truncada=busca_truncada,
+                           limite_busca=LIMITE_BUSCA_PAGINA)
+
+
+@app.route('/api/busca')
+def api_busca():
+    """Busca clientes (professor) ou usuários (admin) e retorna JSON ordenado por relevância."""
+    if not session.get('logged_in') or session.get('perfil') not in ['professor', 'admin']:
+        return jsonify(erro='Acesso negado.'), 403
+
+    termo = request.args.get('q', '').strip()
+    tipo = request.args.get('tipo', 'clientes')
+    limite = max(1, min(request.args.get('limite', 20, type=int), 100))
+
+    if tipo == 'usuarios':
+        if session.get('perfil') != 'admin':
+            return jsonify(erro='Apenas administradores podem buscar usuários.'), 403
+        resultados = [
+            {'nome_completo': u['nome_completo'], 'celular': u['celular'], 'perfil': u['perfil']}
+            for u in buscar_usuarios(termo, limite)
+        ]
+    elif tipo == 'clientes':
+        resultados = [
+            {'id': c['id'], 'nome': c['nome'], 'objetivo': c['objetivo'], 'aluno_celular': c.get('aluno_celular')}
+            for c in buscar_clientes(termo, session.get('user_celular'), limite)
+        ]
+    else:
+        return jsonify(erro='Tipo de busca inválido.'), 400
+
+    return jsonify(termo=termo, tipo=tipo, resultados=resultados)
 
 
 @app.route('/cadastro', methods=['GET', 'POST'])
@@ -690,4 +1018,5 @@ if __name__ == '__main__':
     # Inicializa o agendador *antes* de rodar o app
     iniciar_agendador()
     # use_reloader=False é NECESSÁRIO para que o agendador não duplique a tarefa.
+    # Em debug, asset() serve static/ direto; em produção rode antes: python assets.py construir
     app.run(debug=True, use_reloader=False)
\ No newline at end of file
@@ -0,0 +1,239 @@
+"""Pipeline de arquivos estáticos do Hashem Personal Trainer.
+
+Uso (rodar antes de publicar e sempre que algo em static/ mudar):
+    python assets.py construir   # gera static/dist com nomes por hash, .gz/.br e assets_manifest.json
+    python assets.py verificar   # falha se algum template ou imagem de exercício escapar do manifesto
+    python assets.py limpar      # apaga de static/dist o que não pertence ao build atual
+
+Cada build mantém os arquivos dos builds anteriores: processos ainda rodando com o manifesto
+antigo e páginas em cache continuam encontrando as URLs que já publicaram. Rode `limpar` só
+depois de reiniciar o app e de o cache das páginas antigas expirar.
+
+Em modo debug o app ignora o manifesto e serve static/ diretamente.
+"""
+import ast
+import gzip
+import hashlib
+import json
+import os
+import re
+import sys
+
+try:
+    import brotli  # Opcional: sem ele, apenas a versão .gz é gerada
+except ImportError:
+    brotli = None
+
+# Caminhos absolutos a partir desta pasta (a mesma do app.py), independentes do diretório atual
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+STATIC_DIR = os.path.join(BASE_DIR, 'static')
+DIST_DIR = os.path.join(STATIC_DIR, 'dist')
+TEMPLATES_DIR = os.path.join(BASE_DIR, 'templates')
+APP_FILE = os.path.join(BASE_DIR, 'app.py')
+# Fora de static/dist para não ser servido com cache imutável
+MANIFEST_FILE = os.path.join(BASE_DIR, 'assets_manifest.json')
+
+# Apenas formatos de texto compensam compressão; imagens já são comprimidas
+EXTENSOES_COMPRIMIVEIS = {'.css', '.js', '.svg', '.json', '.txt', '.html'}
+
+# Referências que ignoram o manifesto: url_for('static', ...) ou caminhos literais /static/...
+PADRAO_SEM_HASH = re.compile(r"""url_for\(\s*['"]static['"]|["'(]/static/""")
+PADRAO_ASSET = re.compile(r"""\basset\(([^)]*)\)""")
+PADRAO_LITERAL = re.compile(r"""(['"])([^'"]*)\1""")
+
+
+# --- Construção ---
+
+def nome_com_hash(caminho_relativo, conteudo):
+    """Insere os 10 primeiros dígitos do SHA-256 antes da extensão (style.css -> style.1a2b3c4d5e.css)."""
+    digest = hashlib.sha256(conteudo).hexdigest()[:10]
+    base, ext = os.path.splitext(caminho_relativo)
+    return f'{base}.{digest}{ext}'
+
+
+def _arquivos_fonte():
+    """Lista (caminho relativo, caminho absoluto) de cada arquivo de static/, exceto static/dist."""
+    for raiz, pastas, arquivos in os.walk(STATIC_DIR):
+        pastas[:] = sorted(p for p in pastas if os.path.join(raiz, p) != DIST_DIR)
+        for arquivo in sorted(arquivos):
+            origem = os.path.join(raiz, arquivo)
+            yield os.path.relpath(origem, STATIC_DIR).replace(os.sep, '/'), origem
+
+
+def _gravar(caminho, conteudo):
+    os.makedirs(os.path.dirname(caminho), exist_ok=True)
+    with open(caminho, 'wb') as f:
+        f.write(conteudo)
+
+
+def _ler_manifesto():
+    """Lê o arquivo de manifesto: {'arquivos': nome original -> nome com hash, 'publicados': [nomes com hash]}."""
+    if not os.path.exists(MANIFEST_FILE):
+        return {'arquivos': {}, 'publicados': []}
+    with open(MANIFEST_FILE, 'r') as f:
+        try:
+            dados = json.load(f)
+        except json.JSONDecodeError:
+            return {'arquivos': {}, 'publicados': []}
+    if 'arquivos' not in dados:  # Formato antigo: apenas o mapeamento
+        dados = {'arquivos': dados, 'publicados': list(dados.values())}
+    return dados
+
+
+def _gravar_manifesto(arquivos, publicados):
+    dados = {'arquivos': arquivos, 'publicados': sorted(publicados)}
+    _gravar(MANIFEST_FILE, json.dumps(dados, indent=4, sort_keys=True).encode('utf-8'))
+
+
+def construir_assets():
+    """Copia cada arquivo de static/ para static/dist/ com hash no nome e gera as versões comprimidas.
+
+    Arquivos de builds anteriores são mantidos (nomes com hash nunca colidem) e continuam publicados.
+    """
+    anterior = _ler_manifesto()
+
+    manifesto = {}
+    for relativo, origem in _arquivos_fonte():
+        with open(origem, 'rb') as f:
+            conteudo = f.read()
+
+        destino_relativo = nome_com_hash(relativo, conteudo)
+        destino = os.path.join(DIST_DIR, destino_relativo)
+        manifesto[relativo] = destino_relativo
+        if os.path.exists(destino):
+            continue  # Mesmo hash, mesmo conteúdo: já gerado por um build anterior
+        _gravar(destino, conteudo)
+
+        if os.path.splitext(relativo)[1].lower() in EXTENSOES_COMPRIMIVEIS:
+            # mtime=0 mantém o .gz idêntico entre builds com o mesmo conteúdo
+            _gravar(destino + '.gz', gzip.compress(conteudo, compresslevel=9, mtime=0))
+            if brotli is not None:
+                _gravar(destino + '.br', brotli.compress(conteudo, quality=11))
+
+    anteriores = set(anterior['publicados']) | set(anterior['arquivos'].values())
+    publicados = {nome for nome in anteriores if os.path.exists(os.path.join(DIST_DIR, nome))}
+    _gravar_manifesto(manifesto, publicados | set(manifesto.values()))
+    return manifesto
+
+
+def limpar_assets():
+    """Apaga de static/dist/ os arquivos (e versões .gz/.br) que não pertencem ao build atual."""
+    manifesto = carregar_manifesto()
+    if not manifesto:
+        return 0  # Sem build atual não há como saber o que manter
+    manter = set(manifesto.values())
+    removidos = 0
+    for raiz, _, arquivos in os.walk(DIST_DIR, topdown=False):
+        for arquivo in arquivos:
+            caminho = os.path.join(raiz, arquivo)
+            relativo = os.path.relpath(caminho, DIST_DIR).replace(os.sep, '/')
+            base, ext = os.path.splitext(relativo)
+            if relativo not in manter and not (ext in ('.gz', '.br') and base in manter):
+                os.remove(caminho)
+                removidos += 1
+        if raiz != DIST_DIR and not os.listdir(raiz):
+            os.rmdir(raiz)
+    _gravar_manifesto(manifesto, manter)
+    return removidos
+
+
+def carregar_manifesto():
+    """Retorna o manifesto do build atual (nome original -> nome com hash), ou {} sem build."""
+    return _ler_manifesto()['arquivos']
+
+
+def carregar_publicados():
+    """Retorna os nomes com hash de todos os builds ainda presentes em static/dist/."""
+    dados = _ler_manifesto()
+    return set(dados['publicados']) | set(dados['arquivos'].values())
+
+
+def arquivos_desatualizados(manifesto):
+    """Lista os arquivos de static/ cujo conteúdo atual não corresponde ao hash do manifesto."""
+    desatualizados = []
+    encontrados = set()
+    for relativo, origem in _arquivos_fonte():
+        encontrados.add(relativo)
+        with open(origem, 'rb') as f:
+            if manifesto.get(relativo) != nome_com_hash(relativo, f.read()):
+                desatualizados.append(relativo)
+    desatualizados.extend(sorted(set(manifesto) - encontrados))  # Removidos de static/ após o build
+    return desatualizados
+
+
+# --- Verificação ---
+
+def _imagens_exercicios():
+    """Lê IMAGENS_EXERCICIOS do app.py sem importá-lo (o import carrega dados e o Flask)."""
+    with open(APP_FILE, 'r', encoding='utf-8') as f:
+        arvore = ast.parse(f.read())
+    for no in arvore.body:
+        if isinstance(no, ast.Assign) and any(getattr(alvo, 'id', None) == 'IMAGENS_EXERCICIOS' for alvo in no.targets):
+            return no.lineno, ast.literal_eval(no.value)
+    return 0, {}
+
+
+def verificar_templates(manifesto):
+    """Retorna (local, mensagem) para cada referência a arquivo estático que não resolve para um nome com hash."""
+    problemas = []
+    for arquivo in sorted(os.listdir(TEMPLATES_DIR)):
+        if not arquivo.endswith('.html'):
+            continue
+        caminho = os.path.relpath(os.path.join(TEMPLATES_DIR, arquivo), BASE_DIR)
+        with open(os.path.join(TEMPLATES_DIR, arquivo), 'r', encoding='utf-8') as f:
+            for numero, linha in enumerate(f, start=1):
+                local = f'{caminho}:{numero}'
+                if PADRAO_SEM_HASH.search(linha):
+                    problemas.append((local, f'referência sem hash, use asset(...): {linha.strip()}'))
+
+                for argumento in PADRAO_ASSET.findall(linha):
+                    literal = PADRAO_LITERAL.fullmatch(argumento.strip())
+                    if literal:
+                        if literal.group(2) not in manifesto:
+                            problemas.append((local, f"asset('{literal.group(2)}') não está no manifesto"))
+                    elif 'imagens_exercicios' not in argumento:
+                        # Nomes montados em tempo de execução só são verificáveis se vierem de IMAGENS_EXERCICIOS
+                        problemas.append((local, f'asset({argumento.strip()}) não pode ser verificado'))
+
+    linha, imagens = _imagens_exercicios()
+    for exercicio, imagem in sorted(imagens.items()):
+        if f'images/{imagem}' not in manifesto:
+            problemas.append((f'app.py:{linha}', f"imagem de '{exercicio}' não está no manifesto: images/{imagem}"))
+
+    for relativo in arquivos_desatualizados(manifesto):
+        problemas.append((f'static/{relativo}', 'alterado após o último build, rode: python assets.py construir'))
+    return problemas
+
+
+def main(argv):
+    comando = argv[1] if len(argv) > 1 else 'construir'
+
+    if comando == 'construir':
+        manifesto = construir_assets()
+        print(f"✅ {len(manifesto)} arquivos gerados em {os.path.relpath(DIST_DIR, BASE_DIR)}"
+              f"{'' if brotli else ' (brotli não instalado: apenas .gz)'}.")
+        return 0
+
+    if comando == 'limpar':
+        print(f"✅ {limpar_assets()} arquivos de builds anteriores removidos de {os.path.relpath(DIST_DIR, BASE_DIR)}.")
+        return 0
+
+    if comando == 'verificar':
+        manifesto = carregar_manifesto()
+        if not manifesto:
+            print("⚠️ Manifesto não encontrado. Rode primeiro: python assets.py construir")
+            return 1
+        problemas = verificar_templates(manifesto)
+        for local, mensagem in problemas:
+            print(f"{local}: {mensagem}")
+        if problemas:
+            return 1
+        print("✅ Todas as referências a arquivos estáticos usam nomes com hash.")
+        return 0
+
+    print(__doc__)
+    return 2
+
+
+if __name__ == '__main__':
+    sys.exit(main(sys.argv))